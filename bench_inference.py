@@ -0,0 +1,124 @@
+import sys
+import threading
+import time
+import numpy as np
+import tensorflow as tf
+from inference import InferenceExecutor, ServerBusyError
+
+# Simulates many Streamlit sessions sending images at the same time and compares
+# two ways of serving them:
+#   direct - every session calls model.predict itself, as the detector page used to
+#   pooled - every session goes through the shared InferenceExecutor
+# Usage: python bench_inference.py [model_path]
+
+IMAGE_SIZE = (128, 128)
+
+# Number of concurrent sessions to test, and requests sent by each session
+SESSION_COUNTS = [1, 2, 4, 8, 16, 32]
+REQUESTS_PER_SESSION = 20
+
+# Once there are enough sessions to fill every worker and queue slot, the pooled
+# p99 should stay flat. The run fails if p99 at the largest session count is more
+# than this many times p99 at the first session count that fills the pool.
+MAX_P99_RATIO = 1.5
+
+
+def run_session(predict, img_array, latencies, busy, lock):
+    """
+    Sends REQUESTS_PER_SESSION predictions one after another, like a user uploading images.
+    """
+    for _ in range(REQUESTS_PER_SESSION):
+        start = time.perf_counter()
+        try:
+            predict(img_array)
+        except ServerBusyError:
+            with lock:
+                busy.append(1)
+            continue
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run_load(predict, sessions):
+    """
+    Runs the given number of sessions at once and returns (p50, p99, rejection rate, throughput).
+    Latencies only cover served requests, so the rejection rate must be read next to them.
+    """
+    img_array = np.random.rand(1, IMAGE_SIZE[0], IMAGE_SIZE[1], 3).astype('float32')
+    latencies, busy = [], []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=run_session, args=(predict, img_array, latencies, busy, lock))
+        for _ in range(sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    p50 = np.percentile(latencies, 50) if latencies else float('nan')
+    p99 = np.percentile(latencies, 99) if latencies else float('nan')
+    rejected = len(busy) / (sessions * REQUESTS_PER_SESSION)
+    return p50, p99, rejected, len(latencies) / elapsed
+
+
+def benchmark(name, predict):
+    """
+    Prints a latency table for each session count and returns p99 by session count.
+    """
+    print(f"\n{name}")
+    print(f"{'Sessions':>8}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Rejected':>10}{'Throughput (img/s)':>20}")
+    p99_by_sessions = {}
+    for sessions in SESSION_COUNTS:
+        p50, p99, rejected, throughput = run_load(predict, sessions)
+        p99_by_sessions[sessions] = p99
+        print(f"{sessions:>8}{p50:>10.1f}{p99:>10.1f}{rejected:>10.1%}{throughput:>20.1f}")
+    return p99_by_sessions
+
+
+def main():
+    model_path = sys.argv[1] if len(sys.argv) > 1 else 'brain_model.keras'
+
+    # Importing inference has already applied the thread settings before this first op
+    model = tf.keras.models.load_model(model_path)
+    executor = InferenceExecutor()
+
+    def direct(img_array):
+        return model.predict(img_array, verbose=0)
+
+    def pooled(img_array):
+        return executor.predict(model, img_array)
+
+    # Warm-up so graph tracing is not counted
+    warmup = np.random.rand(1, IMAGE_SIZE[0], IMAGE_SIZE[1], 3).astype('float32')
+    for _ in range(5):
+        direct(warmup)
+        pooled(warmup)
+
+    print(f"Model: {model_path} | workers: {executor.num_workers} | max queue: {executor.max_queue}")
+    print(f"TensorFlow threads: intra-op {tf.config.threading.get_intra_op_parallelism_threads()} | "
+          f"inter-op {tf.config.threading.get_inter_op_parallelism_threads()}")
+
+    direct_p99 = benchmark("Direct model.predict (previous behaviour)", direct)
+    pooled_p99 = benchmark("Shared inference pool", pooled)
+    executor.shutdown()
+
+    # Compare from the first session count that fills every worker and queue slot
+    pool_size = executor.num_workers + executor.max_queue
+    saturated = [s for s in SESSION_COUNTS if s >= pool_size] or SESSION_COUNTS[-1:]
+    base, most = saturated[0], SESSION_COUNTS[-1]
+    direct_ratio = direct_p99[most] / direct_p99[base]
+    pooled_ratio = pooled_p99[most] / pooled_p99[base]
+    print(f"\np99 ratio ({most} / {base} sessions): direct {direct_ratio:.2f}x | pooled {pooled_ratio:.2f}x "
+          f"(limit {MAX_P99_RATIO:.2f}x)")
+
+    if not pooled_ratio <= MAX_P99_RATIO:
+        sys.exit(f"FAIL: pooled p99 grew {pooled_ratio:.2f}x from {base} to {most} sessions, "
+                 f"more than the allowed {MAX_P99_RATIO:.2f}x.")
+    print("PASS: pooled p99 stays stable as sessions grow.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import math
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import (
+    Input, Conv2D, SeparableConv2D, BatchNormalization, MaxPooling2D,
+    GlobalAveragePooling2D, Dropout, Dense, Softmax
+)
+from tensorflow.keras.callbacks import EarlyStopping
+
+# Distillation trains a small "student" network to mimic the predictions of the
+# trained MobileNetV2 "teacher" (brain_model.keras) so the detector page can
+# serve a lighter model on CPU-only machines.
+
+# Keep these in sync with train.py
+IMAGE_SIZE = (128, 128)
+BATCH_SIZE = 32
+NUM_CLASSES = 4
+
+# Path to your dataset
+# Make sure this matches your folder structure exactly
+DATASET_PATH = 'C:/Users/HP/Downloads/archive (1)/Training'
+
+TEACHER_PATH = 'brain_model.keras'
+STUDENT_PATH = 'brain_model_student.keras'
+
+# Temperature softens the teacher's probabilities so the student also learns
+# how similar the classes look to each other, not only the top label.
+# ALPHA weights the hard-label loss against the soft-target loss.
+TEMPERATURE = 4.0
+ALPHA = 0.1
+
+# Number of timed single-image predictions used for the CPU latency report
+LATENCY_RUNS = 50
+
+# Training data gets the same augmentation as train.py
+train_datagen = ImageDataGenerator(
+    rescale=1./255,
+    rotation_range=20,
+    width_shift_range=0.2,
+    height_shift_range=0.2,
+    shear_range=0.2,
+    zoom_range=0.2,
+    horizontal_flip=True,
+    fill_mode='nearest',
+    validation_split=0.2
+)
+
+# Validation images are only rescaled so teacher and student are compared fairly
+eval_datagen = ImageDataGenerator(
+    rescale=1./255,
+    validation_split=0.2
+)
+
+train_generator = train_datagen.flow_from_directory(
+    DATASET_PATH,
+    target_size=IMAGE_SIZE,
+    batch_size=BATCH_SIZE,
+    class_mode='categorical',
+    subset='training'
+)
+
+validation_generator = eval_datagen.flow_from_directory(
+    DATASET_PATH,
+    target_size=IMAGE_SIZE,
+    batch_size=BATCH_SIZE,
+    class_mode='categorical',
+    subset='validation',
+    shuffle=False
+)
+
+
+def build_student():
+    """
+    Builds a compact CNN that outputs raw logits (no softmax).
+    Depthwise separable convolutions keep the parameter count and CPU cost low.
+    """
+    return Sequential([
+        Input(shape=(IMAGE_SIZE[0], IMAGE_SIZE[1], 3)),
+        Conv2D(16, 3, strides=2, padding='same', activation='relu'),
+        BatchNormalization(),
+        SeparableConv2D(32, 3, padding='same', activation='relu'),
+        BatchNormalization(),
+        MaxPooling2D(),
+        SeparableConv2D(64, 3, padding='same', activation='relu'),
+        BatchNormalization(),
+        MaxPooling2D(),
+        SeparableConv2D(128, 3, padding='same', activation='relu'),
+        BatchNormalization(),
+        MaxPooling2D(),
+        GlobalAveragePooling2D(),
+        Dropout(0.3),
+        Dense(NUM_CLASSES)
+    ], name='student')
+
+
+class Distiller(tf.keras.Model):
+    """
+    Trains the student on a mix of the true labels and the teacher's softened predictions.
+    """
+    def __init__(self, student, teacher, temperature=TEMPERATURE, alpha=ALPHA):
+        super().__init__()
+        self.student = student
+        self.teacher = teacher
+        self.temperature = temperature
+        self.alpha = alpha
+        self.hard_loss_fn = tf.keras.losses.CategoricalCrossentropy(from_logits=True)
+        self.soft_loss_fn = tf.keras.losses.KLDivergence()
+        self.loss_tracker = tf.keras.metrics.Mean(name='loss')
+        self.accuracy_tracker = tf.keras.metrics.CategoricalAccuracy(name='accuracy')
+
+    @property
+    def metrics(self):
+        return [self.loss_tracker, self.accuracy_tracker]
+
+    def soften(self, teacher_probs):
+        # The teacher ends in a softmax, so recover its logits with a log before applying the temperature
+        teacher_logits = tf.math.log(tf.clip_by_value(teacher_probs, 1e-7, 1.0))
+        return tf.nn.softmax(teacher_logits / self.temperature)
+
+    def distillation_loss(self, y, teacher_probs, student_logits):
+        hard_loss = self.hard_loss_fn(y, student_logits)
+        soft_loss = self.soft_loss_fn(
+            self.soften(teacher_probs),
+            tf.nn.softmax(student_logits / self.temperature)
+        )
+        # Scale the soft loss by T^2 so its gradients stay comparable to the hard loss
+        return self.alpha * hard_loss + (1 - self.alpha) * soft_loss * self.temperature ** 2
+
+    def train_step(self, data):
+        x, y = data
+        teacher_probs = self.teacher(x, training=False)
+
+        with tf.GradientTape() as tape:
+            student_logits = self.student(x, training=True)
+            loss = self.distillation_loss(y, teacher_probs, student_logits)
+
+        gradients = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(gradients, self.student.trainable_variables))
+
+        self.loss_tracker.update_state(loss)
+        self.accuracy_tracker.update_state(y, student_logits)
+        return {m.name: m.result() for m in self.metrics}
+
+    def test_step(self, data):
+        # Track the same combined loss as training so loss and val_loss are comparable
+        x, y = data
+        teacher_probs = self.teacher(x, training=False)
+        student_logits = self.student(x, training=False)
+        self.loss_tracker.update_state(self.distillation_loss(y, teacher_probs, student_logits))
+        self.accuracy_tracker.update_state(y, student_logits)
+        return {m.name: m.result() for m in self.metrics}
+
+    def call(self, inputs):
+        return self.student(inputs)
+
+
+def evaluate_accuracy(model, generator):
+    """
+    Returns the top-1 accuracy of a softmax model on the (unshuffled) validation set.
+    """
+    generator.reset()
+    predictions = model.predict(generator, verbose=0)
+    return float(np.mean(np.argmax(predictions, axis=1) == generator.classes))
+
+
+def measure_cpu_latency(model, runs=LATENCY_RUNS):
+    """
+    Times single-image inference on the CPU, the way the detector page calls the model.
+    Returns the median and 95th percentile latency in milliseconds.
+    """
+    sample = np.random.rand(1, IMAGE_SIZE[0], IMAGE_SIZE[1], 3).astype('float32')
+    timings = []
+    with tf.device('/CPU:0'):
+        # Warm-up calls so graph tracing is not counted
+        for _ in range(5):
+            model(sample, training=False)
+        for _ in range(runs):
+            start = time.perf_counter()
+            model(sample, training=False)
+            timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+
+if not os.path.exists(TEACHER_PATH):
+    raise FileNotFoundError(f"'{TEACHER_PATH}' not found. Run train.py first to create the teacher model.")
+
+teacher = tf.keras.models.load_model(TEACHER_PATH)
+teacher.trainable = False
+
+student = build_student()
+
+distiller = Distiller(student=student, teacher=teacher)
+distiller.compile(optimizer='adam')
+
+# EarlyStopping restores the best student weights; the student is saved once training ends
+early_stopping = EarlyStopping(
+    monitor='val_accuracy',
+    patience=5,
+    mode='max',
+    restore_best_weights=True
+)
+
+history = distiller.fit(
+    train_generator,
+    steps_per_epoch=train_generator.samples // BATCH_SIZE,
+    epochs=50,
+    validation_data=validation_generator,
+    # Round up so the last partial batch is included; validation is unshuffled,
+    # so dropping it would always skip images from the last class
+    validation_steps=math.ceil(validation_generator.samples / BATCH_SIZE),
+    callbacks=[early_stopping]
+)
+
+# Append a softmax so the saved student outputs probabilities like the teacher
+# and can be loaded by the detector page as a drop-in replacement
+student_model = Sequential([student, Softmax()], name='brain_model_student')
+student_model.save(STUDENT_PATH)
+print(f"Student model saved as {STUDENT_PATH}!")
+
+# --- Teacher vs. student report ---
+report = []
+for name, model in [('Teacher', teacher), ('Student', student_model)]:
+    accuracy = evaluate_accuracy(model, validation_generator)
+    median_ms, p95_ms = measure_cpu_latency(model)
+    report.append((name, accuracy, model.count_params(), median_ms, p95_ms))
+
+print(f"\n{'Model':<10}{'Accuracy':>10}{'Params':>14}{'CPU median (ms)':>18}{'CPU p95 (ms)':>15}")
+for name, accuracy, params, median_ms, p95_ms in report:
+    print(f"{name:<10}{accuracy:>10.4f}{params:>14,}{median_ms:>18.2f}{p95_ms:>15.2f}")
+
+teacher_params, student_params = report[0][2], report[1][2]
+print(f"\nStudent is {teacher_params / student_params:.1f}x smaller and "
+      f"{report[0][3] / report[1][3]:.1f}x faster (median) than the teacher.")
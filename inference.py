@@ -0,0 +1,87 @@
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+import tensorflow as tf
+
+# All Streamlit sessions share the loaded models, so predictions are funnelled
+# through one small fixed pool of worker threads instead of every session calling
+# a model at once and fighting over TensorFlow's CPU threads.
+
+# Number of predictions that run at the same time
+NUM_WORKERS = int(os.environ.get("INFERENCE_WORKERS", 2))
+
+# Number of requests allowed to wait for a free worker before new ones are rejected
+MAX_QUEUE = int(os.environ.get("INFERENCE_MAX_QUEUE", 8))
+
+# Seconds a request waits for a place in the queue before reporting "server busy"
+QUEUE_TIMEOUT = float(os.environ.get("INFERENCE_QUEUE_TIMEOUT", 0.5))
+
+# TensorFlow thread pools. The intra-op pool is a single pool for the whole
+# process that every worker shares, so it gets all the cores; NUM_WORKERS is
+# what limits how many predictions compete for it. Ops inside one prediction
+# run one at a time.
+INTRA_OP_THREADS = int(os.environ.get("TF_INTRA_OP_THREADS", os.cpu_count() or 1))
+INTER_OP_THREADS = int(os.environ.get("TF_INTER_OP_THREADS", 1))
+
+
+class ServerBusyError(Exception):
+    """
+    Raised when the inference queue is full and the request could not be accepted.
+    """
+
+
+def configure_threads(intra_op_threads=INTRA_OP_THREADS, inter_op_threads=INTER_OP_THREADS):
+    """
+    Sets TensorFlow's intra-op and inter-op thread pool sizes.
+    This only works before TensorFlow runs its first op, so it is called once when
+    this module is imported. Returns False and warns if the settings could not be applied.
+    """
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError as e:
+        warnings.warn(
+            f"Could not set TensorFlow threads (intra-op={intra_op_threads}, inter-op={inter_op_threads}) "
+            f"because TensorFlow has already started: {e}"
+        )
+        return False
+    return True
+
+
+configure_threads()
+
+
+class InferenceExecutor:
+    """
+    Runs model predictions on a fixed number of worker threads with a bounded queue.
+    One executor is meant to be shared by every model the server uses.
+    """
+    def __init__(self, num_workers=NUM_WORKERS, max_queue=MAX_QUEUE):
+        self.num_workers = num_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="inference")
+        # One slot per running or waiting request; a full set of slots means the server is busy
+        self._slots = threading.BoundedSemaphore(num_workers + max_queue)
+
+    def predict(self, model, img_array, timeout=QUEUE_TIMEOUT):
+        """
+        Returns the predictions of model for img_array, blocking until a worker has run it.
+        Raises ServerBusyError if no place in the queue frees up within timeout seconds.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise ServerBusyError("The server is busy. Please try again in a moment.")
+        try:
+            future = self._executor.submit(self._run, model, img_array)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def _run(self, model, img_array):
+        # Calling the model directly avoids the per-call overhead of model.predict
+        return model(img_array, training=False).numpy()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import tensorflow as tf
 import numpy as np
@@ -8,6 +9,7 @@ import plotly.express as px
 import json
 import requests
 import time
+from inference import InferenceExecutor, ServerBusyError
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -142,18 +144,47 @@ if "explanation" not in st.session_state:
     st.session_state.explanation = ""
 
 # --- Model Loading and Prediction Logic ---
+# Available model backends. The student is the smaller, faster model produced by distill.py.
+MODEL_BACKENDS = {
+    "Standard (MobileNetV2)": "brain_model.keras",
+    "Fast (distilled student)": "brain_model_student.keras"
+}
+STUDENT_MODEL_PATH = MODEL_BACKENDS["Fast (distilled student)"]
+
+@st.cache_resource
+def get_executor():
+    """
+    Returns the inference executor shared by all sessions and model backends of
+    this Streamlit server, so the number of running and queued predictions stays bounded.
+    """
+    return InferenceExecutor()
+
 @st.cache_resource
-def load_model():
+def load_model(model_path="brain_model.keras"):
     """
     Loads the pre-trained Keras model from the .keras file.
     The model file must be in the same directory as this script.
+    Errors are raised rather than returned so a failed load is not cached and a
+    model file added or fixed later is picked up on the next run.
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(model_path)
+    return tf.keras.models.load_model(model_path)
+
+def get_model(model_path):
+    """
+    Returns the cached model for model_path, or shows an error and returns None if it cannot be loaded.
     """
     try:
-        model = tf.keras.models.load_model("brain_model.keras")
-        return model
+        return load_model(model_path)
     except FileNotFoundError:
-        st.error("Error: 'brain_model.keras' not found. Please make sure the model file is in the same folder as this script.")
-        return None
+        if model_path == STUDENT_MODEL_PATH:
+            st.error(f"Error: '{model_path}' not found. Run distill.py first to create the fast model, or switch to the standard model.")
+        else:
+            st.error(f"Error: '{model_path}' not found. Please make sure the model file is in the same folder as this script.")
+    except ValueError as e:
+        st.error(f"Error: '{model_path}' could not be loaded. The file may be corrupt or saved with an incompatible Keras version. Details: {e}")
+    return None
 
 def preprocess_image(image_bytes):
     """
@@ -198,6 +229,12 @@ def home_page():
     st.markdown("<h1 class='main-header'>Brain Anomaly Detector</h1>", unsafe_allow_html=True)
     st.markdown("<h3 class='subheader'>Upload a medical image to check for anomalies.</h3>", unsafe_allow_html=True)
 
+    backend = st.sidebar.selectbox(
+        "Model backend",
+        list(MODEL_BACKENDS.keys()),
+        help="The fast model is a distilled version of the standard model for quicker analysis on CPU."
+    )
+
     col1, col2 = st.columns([1, 2])
 
     with col1:
@@ -220,10 +257,16 @@ def home_page():
     with col2:
         if uploaded_file is not None:
             with st.spinner('Analyzing the image...'):
-                model = load_model()
+                model = get_model(MODEL_BACKENDS[backend])
+                predictions = None
                 if model:
                     img_array = preprocess_image(image_bytes)
-                    predictions = model.predict(img_array)
+                    try:
+                        predictions = get_executor().predict(model, img_array)
+                    except ServerBusyError:
+                        st.markdown("<div class='warning-box'>⏳ The server is busy analyzing other images. Please try again in a moment.</div>", unsafe_allow_html=True)
+                        st.button("Try Again")
+                if predictions is not None:
                     predicted_class_index = np.argmax(predictions)
                     confidence = np.max(predictions)
 